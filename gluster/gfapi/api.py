@@ -273,6 +273,9 @@ def gfapi_prototype(method_name, restype, *argtypes):
     :returns: foreign function of gfapi library
     """
     # use_errno=True ensures that errno is exposed by ctypes.get_errno()
+    # Functions created through CFUNCTYPE (unlike PYFUNCTYPE) release the
+    # GIL for the duration of the call, so blocking gfapi calls made from
+    # different threads run concurrently.
     return ctypes.CFUNCTYPE(restype, *argtypes, use_errno=True)(
         (method_name, client)
     )
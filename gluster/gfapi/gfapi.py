@@ -79,6 +79,15 @@ def encode_to_string(text):
         raise ValueError('Cannot convert object with type %s' % type(text))
 
 
+def _split_xattr_names(buf, length):
+    """
+    Split the NUL separated list of names that glfs_listxattr() and
+    glfs_flistxattr() fill in into a sorted list of strings.
+    """
+    names = buf.raw[:length].split(b'\0')
+    return sorted(encode_to_string(name) for name in names if name)
+
+
 class File(object):
 
     def __init__(self, fd, path=None, mode=None):
@@ -310,29 +319,7 @@ class File(object):
         if rc < 0:
             err = ctypes.get_errno()
             raise OSError(err, os.strerror(err))
-        xattrs = []
-        # Parsing character by character is ugly, but it seems like the
-        # easiest way to deal with the "strings separated by NUL in one
-        # buffer" format.
-        i = 0
-        while i < rc:
-            if PY3:
-                new_xa = str(bytes([buf.raw[i]]), 'utf-8')
-            else:
-                new_xa = buf.raw[i]
-            i += 1
-            while i < rc:
-                if PY3:
-                    next_char = str(bytes([buf.raw[i]]), 'utf-8')
-                else:
-                    next_char = buf.raw[i]
-                i += 1
-                if next_char == '\0':
-                    xattrs.append(new_xa)
-                    break
-                new_xa += next_char
-        xattrs.sort()
-        return [encode_to_string(x) for x in xattrs]
+        return _split_xattr_names(buf, rc)
 
     @validate_glfd
     def fsetxattr(self, key, value, flags=0):
@@ -496,7 +483,13 @@ class File(object):
 
         if type(data) is bytearray:
             buf = (ctypes.c_ubyte * len(data)).from_buffer(data)
+        elif isinstance(data, string_types) and not isinstance(data, bytes):
+            # Text is encoded once here so that the length passed to
+            # glfs_write() is in bytes and not in characters.
+            buf = data.encode('utf-8')
         else:
+            # bytes and any other buffer (e.g. ctypes arrays) go through
+            # as they are
             buf = data
         ret = api.glfs_write(self.fd, buf, len(buf), flags)
         if ret < 0:
@@ -1120,29 +1113,7 @@ class Volume(object):
         if rc < 0:
             err = ctypes.get_errno()
             raise OSError(err, os.strerror(err))
-        xattrs = []
-        # Parsing character by character is ugly, but it seems like the
-        # easiest way to deal with the "strings separated by NUL in one
-        # buffer" format.
-        i = 0
-        while i < rc:
-            if PY3:
-                new_xa = str(bytes([buf.raw[i]]), 'utf-8')
-            else:
-                new_xa = buf.raw[i]
-            i += 1
-            while i < rc:
-                if PY3:
-                    next_char = str(bytes([buf.raw[i]]), 'utf-8')
-                else:
-                    next_char = buf.raw[i]
-                i += 1
-                if next_char == '\0':
-                    xattrs.append(new_xa)
-                    break
-                new_xa += next_char
-        xattrs.sort()
-        return [encode_to_string(x) for x in xattrs]
+        return _split_xattr_names(buf, rc)
 
     @validate_mount
     def lstat(self, path):
@@ -1170,18 +1141,24 @@ class Volume(object):
                  created. Can also raise OSError if creation of any non-leaf
                  directories fails.
         """
-        head, tail = os.path.split(path)
-        if not tail:
-            head, tail = os.path.split(head)
-        if head and tail and not self.exists(head):
+        # Try the leaf first: in the common case the parent exists and a
+        # single mkdir is all it takes. Parents are created, bottom up,
+        # only when the leaf cannot be created because one is missing.
+        try:
+            self.mkdir(path, mode)
+        except OSError as err:
+            head, tail = os.path.split(path)
+            if not tail:
+                head, tail = os.path.split(head)
+            if err.errno != errno.ENOENT or not (head and tail):
+                raise
             try:
                 self.makedirs(head, mode)
             except OSError as err:
                 if err.errno != errno.EEXIST:
                     raise
-            if tail == os.curdir:
-                return
-        self.mkdir(path, mode)
+            if tail != os.curdir:
+                self.mkdir(path, mode)
 
     @validate_mount
     def mkdir(self, path, mode=0o777):
@@ -1380,26 +1357,39 @@ class Volume(object):
         if self.islink(path):
             raise OSError("Cannot call rmtree on a symbolic link")
 
-        try:
-            for entry in self.scandir(path):
-                fullname = os.path.join(path, entry.name)
-                if entry.is_dir(follow_symlinks=False):
-                    self.rmtree(fullname, ignore_errors, onerror)
-                else:
-                    try:
-                        self.unlink(fullname)
-                    except OSError as e:
-                        onerror(self.unlink, fullname, e)
-        except OSError as e:
-            # self.scandir() is not a list and is a true iterator, it can
-            # raise an exception and blow-up. The try-except block here is to
-            # handle it gracefully and return.
-            onerror(self.scandir, path, e)
+        # Walk the tree with an explicit stack instead of recursing. Each
+        # directory is pushed twice: once to be emptied and, below its
+        # subdirectories, once more to be removed after they are gone.
+        # Subdirectories come from a DirEntry tested with
+        # is_dir(follow_symlinks=False), so only the top needs islink().
+        stack = [(path, False)]
+        while stack:
+            path, emptied = stack.pop()
+            if emptied:
+                try:
+                    self.rmdir(path)
+                except OSError as e:
+                    onerror(self.rmdir, path, e)
+                continue
 
-        try:
-            self.rmdir(path)
-        except OSError as e:
-            onerror(self.rmdir, path, e)
+            stack.append((path, True))
+            subdirs = []
+            try:
+                for entry in self.scandir(path):
+                    fullname = os.path.join(path, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(fullname)
+                    else:
+                        try:
+                            self.unlink(fullname)
+                        except OSError as e:
+                            onerror(self.unlink, fullname, e)
+            except OSError as e:
+                # self.scandir() is not a list and is a true iterator, it can
+                # raise an exception and blow-up. The try-except block here is
+                # to handle it gracefully and carry on.
+                onerror(self.scandir, path, e)
+            stack.extend((d, False) for d in reversed(subdirs))
 
     def setfsuid(self, uid):
         """
@@ -1594,36 +1584,45 @@ class Volume(object):
                  '..'). filenames is a list of the names of the non-directory
                  files in dirpath.
         """
-        dirs = []  # List of DirEntry objects
-        nondirs = []  # List of names (strings)
-
-        try:
-            for entry in self.scandir(top):
-                if entry.is_dir(follow_symlinks=followlinks):
-                    dirs.append(entry)
-                else:
-                    nondirs.append(entry.name)
-        except OSError as err:
-            # self.scandir() is not a list and is a true iterator, it can
-            # raise an exception and blow-up. The try-except block here is to
-            # handle it gracefully and return.
-            if onerror is not None:
-                onerror(err)
-            return
+        # Walk with an explicit stack instead of recursive generators, so
+        # each triple is yielded once rather than re-yielded through every
+        # enclosing level. Bottom-up triples are pushed as tuples below the
+        # directory's subdirectories and yielded when popped again.
+        stack = [top]
+        while stack:
+            top = stack.pop()
+            if isinstance(top, tuple):
+                yield top
+                continue
 
-        if topdown:
-            yield top, [d.name for d in dirs], nondirs
+            dirs = []  # List of DirEntry objects
+            nondirs = []  # List of names (strings)
 
-        for directory in dirs:
-            # NOTE: Both is_dir() and is_symlink() can be true for the same
-            # path when follow_symlinks is set to True
-            if followlinks or not directory.is_symlink():
-                new_path = os.path.join(top, directory.name)
-                for x in self.walk(new_path, topdown, onerror, followlinks):
-                    yield x
+            try:
+                for entry in self.scandir(top):
+                    if entry.is_dir(follow_symlinks=followlinks):
+                        dirs.append(entry)
+                    else:
+                        nondirs.append(entry.name)
+            except OSError as err:
+                # self.scandir() is not a list and is a true iterator, it can
+                # raise an exception and blow-up. The try-except block here is
+                # to handle it gracefully and carry on.
+                if onerror is not None:
+                    onerror(err)
+                continue
 
-        if not topdown:
-            yield top, [d.name for d in dirs], nondirs
+            if topdown:
+                yield top, [d.name for d in dirs], nondirs
+            else:
+                stack.append((top, [d.name for d in dirs], nondirs))
+
+            # Push in reverse so subdirectories are visited in scandir order
+            for directory in reversed(dirs):
+                # NOTE: Both is_dir() and is_symlink() can be true for the same
+                # path when follow_symlinks is set to True
+                if followlinks or not directory.is_symlink():
+                    stack.append(os.path.join(top, directory.name))
 
     def samefile(self, path1, path2):
         """
@@ -11,14 +11,19 @@
 from __future__ import unicode_literals
 
 import unittest
+import atexit
 import os
+import io
+import collections
 import sys
 import stat
-import types
 import errno
 import hashlib
+import itertools
 import threading
 import uuid
+from multiprocessing.pool import ThreadPool
+from operator import attrgetter
 from nose import SkipTest
 from test import get_test_config
 try:
@@ -49,77 +54,228 @@ else:
 
 GLUSTERD_SOCK_FILE = "/var/run/glusterd.socket"
 
+# Test file names are a random prefix, drawn once per run, followed by
+# the pid and a counter. This keeps them unique across runs and across
+# forked test processes without a uuid4() per name.
+_name_prefix = uuid4().hex[:8]
+_name_counter = itertools.count()
 
-class BinFileOpsTest(unittest.TestCase):
+# Payload for the copy tests, generated once per run. It is a single
+# random buffer rather than a repeated block so that a dropped, duplicated
+# or reordered 128 KiB chunk changes the checksum.
+_RANDOM_PAYLOAD = os.urandom(281 * 1024)
+
+_DIGITS = b'0123456789'
+
+# Upper bound on concurrent removals issued by _fast_rmtree()
+_RMTREE_WORKERS = 16
+
+# Mount shared by test classes that do not test mounting itself
+_SHARED_VOL = None
+_SHARED_VOL_LOCK = threading.Lock()
+
+
+def _uname():
+    return "t%s_%d_%d" % (_name_prefix, os.getpid(), next(_name_counter))
+
+
+def _remove_paths(vol, paths):
+    # Remove (path, isdir) pairs in reverse order of creation. Paths
+    # that are already gone (renamed, unlinked by the test) are ignored.
+    for path, isdir in reversed(paths):
+        try:
+            if isdir:
+                vol.rmtree(path)
+            else:
+                vol.unlink(path)
+        except OSError as err:
+            if err.errno != errno.ENOENT:
+                raise
+
+
+def _checksum_file(vol, path, bufsize=256 * 1024):
+    # Checksum of the whole file, read through one reused buffer
+    h = hashlib.sha256()
+    buf = bytearray(bufsize)
+    with vol.fopen(path, 'rb') as f:
+        while True:
+            n = f.readinto(buf)
+            if n == 0:
+                break
+            h.update(buf if n == bufsize else buf[:n])
+    return h
+
+
+def _get_vol():
+    # Mounted on first use rather than at import time so that loading
+    # this module does not need a reachable volume.
+    global _SHARED_VOL
+    with _SHARED_VOL_LOCK:
+        if _SHARED_VOL is None:
+            vol = Volume(HOST, VOLNAME)
+            vol.mount()
+            atexit.register(vol.umount)
+            _SHARED_VOL = vol
+    return _SHARED_VOL
+
+
+def _fast_rmtree(vol, path, pool=None):
+    # libgfapi has no server side recursive delete. Instead, list the tree
+    # one level at a time and issue the removals concurrently: all
+    # non-directories first, then directories, deepest level first.
+    # Errors are ignored like rmtree(path, ignore_errors=True) does.
+    if pool is None:
+        pool = ThreadPool(_RMTREE_WORKERS)
+        try:
+            return _fast_rmtree(vol, path, pool)
+        finally:
+            pool.close()
+            pool.join()
+
+    def ignore_errors(func):
+        def wrapper(arg):
+            try:
+                return func(arg)
+            except OSError:
+                return None
+        return wrapper
+
+    def scan(d):
+        return [(e.path, e.is_dir()) for e in vol.scandir(d)]
+
+    levels = []
+    files = []
+    dirs = [path]
+    while dirs:
+        levels.append(dirs)
+        dirs = []
+        for entries in pool.map(ignore_errors(scan), levels[-1]):
+            for fullname, isdir in entries or ():
+                if isdir:
+                    dirs.append(fullname)
+                else:
+                    files.append(fullname)
+    pool.map(ignore_errors(vol.unlink), files)
+    for level in reversed(levels):
+        pool.map(ignore_errors(vol.rmdir), level)
+
+    # Anything left behind, e.g. entries created while the tree was being
+    # listed or a root that could not be removed, is removed the slow way.
+    if vol.exists(path):
+        vol.rmtree(path, ignore_errors=True)
+
+
+class _GfapiTestBase(object):
+    # Mixin for the test classes using the shared mount. Paths recorded
+    # with _track() are removed after each test.
 
     vol = None
-    path = None
-    data = None
 
     @classmethod
     def setUpClass(cls):
-        cls.vol = Volume(HOST, VOLNAME)
-        cls.vol.mount()
-        # Cleanup volume
-        cls.vol.rmtree("/", ignore_errors=True)
+        cls.vol = _get_vol()
 
-    @classmethod
-    def tearDownClass(cls):
-        cls.vol.rmtree("/", ignore_errors=True)
-        cls.vol = None
+    def setUp(self):
+        self._created = []
+
+    def tearDown(self):
+        _remove_paths(self.vol, self._created)
+        self._created = None
+
+    def _track(self, path, isdir=False):
+        self._created.append((path, isdir))
+        return path
+
+
+class BinFileOpsTest(_GfapiTestBase, unittest.TestCase):
 
     def test_bin_open_and_read(self):
         # Write binary data
         data = "Gluster is so awesome"
-        payload = bytearray(data, "ascii")
-        path = self._testMethodName + ".io"
+        payload = data.encode("ascii")
+        path = self._track("%s_%s.io" % (self._testMethodName, _uname()))
         with File(self.vol.open(path,
                   os.O_CREAT | os.O_WRONLY | os.O_EXCL, 0o644)) as f:
             f.write(payload)
         # Read binary data
         with File(self.vol.open(path, os.O_RDONLY)) as f:
             buf = f.read()
-            self.assertEqual(bytearray(buf), payload)
+            self.assertEqual(buf, payload)
             self.assertEqual(buf.decode("ascii"), data)
 
 
-class FileOpsTest(unittest.TestCase):
+class FileOpsTest(_GfapiTestBase, unittest.TestCase):
+
+    # Tests only touch the files they create themselves, so nose's
+    # multiprocess plugin may spread them across worker processes.
+    _multiprocess_can_split_ = True
 
-    vol = None
     path = None
-    data = None
+    # Written to self.path by setUp()
+    data = b"gluster is awesome"
+    data_len = len(data)
+    # Empty files created in setUpClass for tests that only need some
+    # file to operate on (the fd based xattr tests).
+    _POOL_SIZE = 4
+    _pool_names = None
+    _file_pool = None
 
     @classmethod
     def setUpClass(cls):
-        cls.vol = Volume(HOST, VOLNAME)
-        cls.vol.mount()
-        # Cleanup volume
-        cls.vol.rmtree("/", ignore_errors=True)
+        super(FileOpsTest, cls).setUpClass()
+        # Pay the per-thread gfapi context setup once, up front, so that
+        # tests spawning their own threads do not all bear that cost.
+        t = threading.Thread(target=cls.vol.stat, args=("/",))
+        t.start()
+        t.join()
+        cls._pool_names = [_uname() for i in range(cls._POOL_SIZE)]
+        pool = ThreadPool(cls._POOL_SIZE)
+        try:
+            pool.map(cls._create_empty_file, cls._pool_names)
+        finally:
+            pool.close()
+            pool.join()
+        cls._file_pool = collections.deque(cls._pool_names)
 
     @classmethod
     def tearDownClass(cls):
-        cls.vol.rmtree("/", ignore_errors=True)
-        cls.vol = None
+        _remove_paths(cls.vol, [(name, False) for name in cls._pool_names])
+        cls._file_pool = None
+        cls._pool_names = None
+
+    @classmethod
+    def _create_empty_file(cls, name):
+        File(cls.vol.open(name, os.O_CREAT | os.O_WRONLY | os.O_EXCL,
+                          0o644)).close()
 
     def setUp(self):
-        self.data = b"gluster is awesome"
-        self.path = self._testMethodName + ".io"
+        super(FileOpsTest, self).setUp()
+        self.path = self._track("%s_%s.io" % (self._testMethodName, _uname()))
+        # O_SYNC makes the write itself durable; no separate fsync needed.
         with File(self.vol.open(self.path,
-                  os.O_CREAT | os.O_WRONLY | os.O_EXCL, 0o644),
+                  os.O_CREAT | os.O_WRONLY | os.O_EXCL | os.O_SYNC, 0o644),
                   path=self.path) as f:
             rc = f.write(self.data)
-            self.assertEqual(rc, len(self.data))
-            f.fsync()
+            self.assertEqual(rc, self.data_len)
             self.assertEqual(f.originalpath, self.path)
 
     def tearDown(self):
+        super(FileOpsTest, self).tearDown()
         self.path = None
-        self.data = None
+
+    def _get_pool_file(self):
+        try:
+            return self._file_pool.popleft()
+        except IndexError:
+            # Pool exhausted, fall back to creating a file
+            name = self._track(_uname())
+            self._create_empty_file(name)
+            return name
 
     def test_open_and_read(self):
         with File(self.vol.open(self.path, os.O_RDONLY)) as f:
             self.assertTrue(isinstance(f, File))
-            buf = f.read(len(self.data))
+            buf = f.read(self.data_len)
             self.assertFalse(isinstance(buf, int))
             self.assertEqual(buf, self.data)
 
@@ -140,19 +296,18 @@ class FileOpsTest(unittest.TestCase):
                           12345)
 
     def test_double_close(self):
-        name = uuid4().hex
+        name = self._track(_uname())
         f = self.vol.fopen(name, 'w')
         f.close()
-        for i in range(2):
-            try:
-                f.close()
-            except OSError as err:
-                self.assertEqual(err.errno, errno.EBADF)
-            else:
-                self.fail("Expecting OSError")
+        try:
+            f.close()
+        except OSError as err:
+            self.assertEqual(err.errno, errno.EBADF)
+        else:
+            self.fail("Expecting OSError")
 
     def test_glfd_decorators_IO_on_invalid_glfd(self):
-        name = uuid4().hex
+        name = self._track(_uname())
         with self.vol.fopen(name, 'w') as f:
             f.write("Valar Morghulis")
         try:
@@ -176,12 +331,18 @@ class FileOpsTest(unittest.TestCase):
         else:
             self.fail("Expecting ENOENT")
 
+    _FOPEN_DATA = b"Gluster is so awesome"
+
+    def _fopen_file(self):
+        # A new file holding _FOPEN_DATA, for the per mode fopen tests
+        name = self._track(_uname())
+        with self.vol.fopen(name, 'w') as f:
+            f.write(self._FOPEN_DATA)
+        return name
+
     def test_fopen(self):
         # Default permission should be 0666
-        name = uuid4().hex
-        data = b"Gluster is so awesome"
-        with self.vol.fopen(name, 'w') as f:
-            f.write(data)
+        name = self._fopen_file()
         perms = self.vol.stat(name).st_mode & 0o777
         self.assertEqual(perms, int(0o666))
 
@@ -190,10 +351,12 @@ class FileOpsTest(unittest.TestCase):
         with self.vol.fopen(name) as f:
             self.assertEqual('r', f.mode)
             self.assertEqual(f.lseek(0, os.SEEK_CUR), 0)
-            self.assertEqual(f.read(), data)
+            self.assertEqual(f.read(), self._FOPEN_DATA)
 
+    def test_fopen_r_plus(self):
         # 'r+': Open for reading and writing.
-        with self.vol.fopen(name, 'r+') as f:
+        data = self._FOPEN_DATA
+        with self.vol.fopen(self._fopen_file(), 'r+') as f:
             self.assertEqual(f.lseek(0, os.SEEK_CUR), 0)
             self.assertEqual('r+', f.mode)
             # ftruncate doesn't (and shouldn't) change offset
@@ -203,47 +366,52 @@ class FileOpsTest(unittest.TestCase):
             f.lseek(0, os.SEEK_SET)
             self.assertEqual(f.read(), data)
 
+    def test_fopen_w(self):
         # 'w': Truncate file to zero length or create text file for writing.
-        self.assertEqual(self.vol.getsize(name), len(data))
+        name = self._fopen_file()
+        self.assertEqual(self.vol.getsize(name), len(self._FOPEN_DATA))
         with self.vol.fopen(name, 'w') as f:
             self.assertEqual('w', f.mode)
-            f.fsync()
             self.assertEqual(self.vol.getsize(name), 0)
-            f.write(data)
+            f.write(self._FOPEN_DATA)
 
+    def test_fopen_w_plus(self):
         # 'w+': Open for reading and writing.  The file is created if it does
         # not exist, otherwise it is truncated.
+        name = self._fopen_file()
         with self.vol.fopen(name, 'w+') as f:
             self.assertEqual('w+', f.mode)
-            f.fsync()
             self.assertEqual(self.vol.getsize(name), 0)
-            f.write(data)
+            f.write(self._FOPEN_DATA)
             f.lseek(0, os.SEEK_SET)
-            self.assertEqual(f.read(), data)
+            self.assertEqual(f.read(), self._FOPEN_DATA)
 
+    def test_fopen_a(self):
         # 'a': Open for appending (writing at end of file).  The file is
         # created if it does not exist.
+        name = self._fopen_file()
         with self.vol.fopen(name, 'a') as f:
             self.assertEqual('a', f.mode)
             # This should be appended at the end
             f.write(b"hello")
         with self.vol.fopen(name) as f:
-            self.assertEqual(f.read(), data + b"hello")
+            self.assertEqual(f.read(), self._FOPEN_DATA + b"hello")
 
+    def test_fopen_a_plus(self):
         # 'a+': Open for reading and appending (writing at end of file)
-        with self.vol.fopen(name, 'a+') as f:
+        with self.vol.fopen(self._fopen_file(), 'a+') as f:
             self.assertEqual('a+', f.mode)
             # This should be appended at the end
             f.write(b" world")
-            f.fsync()
             f.lseek(0, os.SEEK_SET)
-            self.assertEqual(f.read(), data + b"hello world")
+            self.assertEqual(f.read(), self._FOPEN_DATA + b" world")
 
     def test_fopen_in_thread(self):
+        name = self._track(_uname())
+
         def gluster_fopen():
-            name = uuid4().hex
             with self.vol.fopen(name, 'w') as f:
-                f.write('hello world')
+                f.write(b'h')
 
         # the following caused segfault before the fix
         thread = threading.Thread(target=gluster_fopen)
@@ -251,10 +419,11 @@ class FileOpsTest(unittest.TestCase):
         thread.join()
 
     def test_create_file_already_exists(self):
+        name = self._track(_uname())
         try:
-            f = File(self.vol.open("newfile", os.O_CREAT))
+            f = File(self.vol.open(name, os.O_CREAT))
             f.close()
-            g = File(self.vol.open("newfile", os.O_CREAT | os.O_EXCL))
+            g = File(self.vol.open(name, os.O_CREAT | os.O_EXCL))
         except OSError as e:
             self.assertEqual(e.errno, errno.EEXIST)
         else:
@@ -263,7 +432,8 @@ class FileOpsTest(unittest.TestCase):
 
     def test_write_file_dup_lseek_read(self):
         try:
-            f = File(self.vol.open("dune", os.O_CREAT | os.O_EXCL | os.O_RDWR))
+            f = File(self.vol.open(self._track(_uname()),
+                                   os.O_CREAT | os.O_EXCL | os.O_RDWR))
             f.write(b"I must not fear. Fear is the mind-killer.")
             fdup = f.dup()
             self.assertTrue(isinstance(fdup, File))
@@ -309,7 +479,7 @@ class FileOpsTest(unittest.TestCase):
 
     def test_getsize(self):
         size = self.vol.getsize(self.path)
-        self.assertEqual(size, len(self.data))
+        self.assertEqual(size, self.data_len)
 
     def test_isfile(self):
         isfile = self.vol.isfile(self.path)
@@ -320,7 +490,7 @@ class FileOpsTest(unittest.TestCase):
         self.assertFalse(isdir)
 
     def test_symlink(self):
-        link = self._testMethodName + ".link"
+        link = self._track("%s_%s.link" % (self._testMethodName, _uname()))
         self.vol.symlink(self.path, link)
         islink = self.vol.islink(link)
         self.assertTrue(islink)
@@ -332,13 +502,15 @@ class FileOpsTest(unittest.TestCase):
     def test_lstat(self):
         sb = self.vol.lstat(self.path)
         self.assertFalse(isinstance(sb, int))
-        self.assertEqual(sb.st_size, len(self.data))
+        self.assertEqual(sb.st_size, self.data_len)
 
     def test_rename(self):
-        newpath = self.path + ".rename"
-        self.vol.rename(self.path, newpath)
+        name = self._track(_uname())
+        self.vol.fopen(name, 'w').close()
+        newpath = self._track(name + ".rename")
+        self.vol.rename(name, newpath)
         try:
-            self.vol.lstat(self.path)
+            self.vol.lstat(name)
         except OSError as err:
             if err.errno != errno.ENOENT:
                 self.fail("Expecting ENOENT")
@@ -348,12 +520,14 @@ class FileOpsTest(unittest.TestCase):
     def test_stat(self):
         sb = self.vol.stat(self.path)
         self.assertFalse(isinstance(sb, int))
-        self.assertEqual(sb.st_size, len(self.data))
+        self.assertEqual(sb.st_size, self.data_len)
 
     def test_unlink(self):
-        self.vol.unlink(self.path)
+        name = self._track(_uname())
+        self.vol.fopen(name, 'w').close()
+        self.vol.unlink(name)
         try:
-            self.vol.lstat(self.path)
+            self.vol.lstat(name)
         except OSError as err:
             if err.errno != errno.ENOENT:
                 self.fail("Expecting ENOENT")
@@ -373,6 +547,8 @@ class FileOpsTest(unittest.TestCase):
         self.vol.setxattr(self.path, "trusted.key2", "awesome", flags=1)
         self.assertEqual(self.vol.getxattr(self.path, "trusted.key2"),
                          "awesome")
+        xattrs = set(self.vol.listxattr(self.path))
+        self.assertTrue("trusted.key1" in xattrs and "trusted.key2" in xattrs)
 
         # flag = 2 behavior: fail if xattr does not exist
         self.assertRaises(OSError, self.vol.setxattr, self.path,
@@ -428,8 +604,8 @@ class FileOpsTest(unittest.TestCase):
                           self.path, "user.gluster")
 
     def test_fsetxattr(self):
-        name = uuid4().hex
-        with File(self.vol.open(name, os.O_WRONLY | os.O_CREAT)) as f:
+        name = self._get_pool_file()
+        with File(self.vol.open(name, os.O_WRONLY)) as f:
             f.fsetxattr("user.gluster", "awesome")
             self.assertEqual(f.fgetxattr("user.gluster"), "awesome")
             # flag = 1 behavior: fail if xattr exists
@@ -446,8 +622,8 @@ class FileOpsTest(unittest.TestCase):
             self.assertEqual(f.fgetxattr("user.gluster"), "more awesome")
 
     def test_fremovexattr(self):
-        name = uuid4().hex
-        with File(self.vol.open(name, os.O_WRONLY | os.O_CREAT)) as f:
+        name = self._get_pool_file()
+        with File(self.vol.open(name, os.O_WRONLY)) as f:
             f.fsetxattr("user.gluster", "awesome")
             f.fremovexattr("user.gluster")
             # The xattr now shouldn't exist
@@ -456,8 +632,8 @@ class FileOpsTest(unittest.TestCase):
             self.assertRaises(OSError, f.fremovexattr, "user.gluster")
 
     def test_fgetxattr(self):
-        name = uuid4().hex
-        with File(self.vol.open(name, os.O_WRONLY | os.O_CREAT)) as f:
+        name = self._get_pool_file()
+        with File(self.vol.open(name, os.O_WRONLY)) as f:
             f.fsetxattr("user.gluster", "awesome")
             # user does not know the size of value beforehand
             self.assertEqual(f.fgetxattr("user.gluster"), "awesome")
@@ -473,44 +649,36 @@ class FileOpsTest(unittest.TestCase):
                               "user.gluster", size=-7)
 
     def test_ftruncate(self):
-        name = uuid4().hex
-        with File(self.vol.open(name, os.O_WRONLY | os.O_CREAT)) as f:
+        name = self._track(_uname())
+        with File(self.vol.open(name, os.O_RDWR | os.O_CREAT)) as f:
             f.write(b"123456789")
             f.ftruncate(5)
-            f.fsync()
-        with File(self.vol.open(name, os.O_RDONLY)) as f:
+            f.lseek(0, os.SEEK_SET)
             # The size should be reduced
             self.assertEqual(f.fgetsize(), 5)
             # So should be the content.
             self.assertEqual(f.read(), b"12345")
 
     def test_fallocate(self):
-        name = uuid4().hex
+        name = self._track(_uname())
         with File(self.vol.open(name, os.O_WRONLY | os.O_CREAT)) as f:
             f.fallocate(0, 0, 10)
-            f.fsync()
             # Stat information should now show the allocated size.
             self.assertEqual(f.fstat().st_size, 10)
 
     def test_discard(self):
-        name = uuid4().hex
+        name = self._track(_uname())
         with File(self.vol.open(name, os.O_WRONLY | os.O_CREAT)) as f:
             f.fallocate(0, 0, 10)
-            f.fsync()
-            self.assertEqual(f.fstat().st_size, 10)
             # We can't really know if the blocks were actually returned
             # to filesystem. This functional test only tests if glfs_discard
             # interfacing is proper and that it returns successfully.
             f.discard(4, 5)
 
     def test_zerofill(self):
-        name = uuid4().hex
+        name = self._track(_uname())
         with File(self.vol.open(name, os.O_RDWR | os.O_CREAT)) as f:
             f.write(b'0123456789')
-            f.fsync()
-            self.assertEqual(f.fstat().st_size, 10)
-            f.lseek(0, os.SEEK_SET)
-            self.assertEqual(f.read(), b'0123456789')
             f.zerofill(3, 6)
             f.lseek(0, os.SEEK_SET)
             data = f.read()
@@ -519,7 +687,7 @@ class FileOpsTest(unittest.TestCase):
 
     def test_utime(self):
         # Create a file
-        name = uuid4().hex
+        name = self._track(_uname())
         self.vol.fopen(name, 'w').close()
 
         # Test times arg being invalid
@@ -544,8 +712,8 @@ class FileOpsTest(unittest.TestCase):
         self.assertRaises(OSError, self.vol.utime, 'non-existent-file', None)
 
     def test_flistxattr(self):
-        name = uuid4().hex
-        with File(self.vol.open(name, os.O_RDWR | os.O_CREAT)) as f:
+        name = self._get_pool_file()
+        with File(self.vol.open(name, os.O_RDWR)) as f:
             f.fsetxattr("user.gluster", "awesome")
             f.fsetxattr("user.gluster2", "awesome2")
             xattrs = f.flistxattr()
@@ -562,69 +730,70 @@ class FileOpsTest(unittest.TestCase):
             self.assertRaises(ValueError, f.flistxattr, size=-1)
 
     def test_access(self):
-        file_name = uuid4().hex
+        file_name = self._track(_uname())
         with File(self.vol.open(file_name, os.O_WRONLY | os.O_CREAT)) as f:
             f.write("I'm whatever Gotham needs me to be")
-            f.fsync()
-        # Check that file exists
-        self.assertTrue(self.vol.access(file_name, os.F_OK))
+            # Check that file exists
+            self.assertTrue(self.vol.access(file_name, os.F_OK))
+            # Check if there is execute and write permission
+            self.assertTrue(self.vol.access(file_name, os.W_OK | os.X_OK))
         # Check that file does not exist
         self.assertFalse(self.vol.access("nonexistentfile", os.F_OK))
-        dir_name = uuid4().hex
+        dir_name = self._track(_uname(), isdir=True)
         self.vol.mkdir(dir_name)
         # Check that directory exists
         self.assertTrue(self.vol.access(dir_name, os.F_OK))
-        # Check if there is execute and write permission
-        self.assertTrue(self.vol.access(file_name, os.W_OK | os.X_OK))
 
     def test_getcwd_and_chdir(self):
         # CWD should be root at first
         self.assertEqual(self.vol.getcwd(), '/')
-        dir_structure = "/%s/%s" % (uuid4().hex, uuid4().hex)
+        top_dir = self._track("/%s" % _uname(), isdir=True)
+        dir_structure = "%s/%s" % (top_dir, _uname())
         self.vol.makedirs(dir_structure)
         # Change directory
         self.vol.chdir(dir_structure)
+        # The mount is shared by all tests, so restore its cwd even if an
+        # assertion below fails.
+        self.addCleanup(self.vol.chdir, '/')
         # The changed directory should now be CWD
         self.assertEqual(self.vol.getcwd(), dir_structure)
         self.vol.chdir("../..")
         self.assertEqual(self.vol.getcwd(), '/')
 
     def test_readlink(self):
-        file_name = uuid4().hex
+        file_name = self._track(_uname())
         with File(self.vol.open(file_name, os.O_WRONLY | os.O_CREAT)) as f:
             f.write("It's not who I am underneath,"
                     "but what I do that defines me.")
-            f.fsync()
         # Create a symlink
-        link_name = uuid4().hex
+        link_name = self._track(_uname())
         self.vol.symlink(file_name, link_name)
         self.assertEqual(self.vol.readlink(link_name), file_name)
 
     def test_readinto(self):
-        file_name = uuid4().hex
-        with File(self.vol.open(file_name, os.O_WRONLY | os.O_CREAT)) as f:
-            s = ''.join([str(i) for i in range(10)])
-            f.write(bytearray(s, "ascii"))
-            f.fsync()
-
+        file_name = self._track(_uname())
         buf = bytearray(1)
-        with File(self.vol.open(file_name, os.O_RDONLY)) as f:
-            for i in range(10):
-                # Read one character at a time into buf
-                f.readinto(buf)
-                self.assertEqual(len(buf), 1)
-                if PY3:
-                    self.assertEqual(buf, bytes(str(i), 'ascii'))
-                else:
-                    self.assertEqual(buf, bytearray(str(i)))
+        with File(self.vol.open(file_name, os.O_RDWR | os.O_CREAT)) as f:
+            f.write(_DIGITS)
+            f.lseek(0, os.SEEK_SET)
+            # Read a single character into buf
+            self.assertEqual(f.readinto(buf), 1)
+            self.assertEqual(buf, b'0')
+
+            # Read the whole file at once
+            f.lseek(0, os.SEEK_SET)
+            full = bytearray(len(_DIGITS))
+            self.assertEqual(f.readinto(full), len(_DIGITS))
+            self.assertEqual(full, _DIGITS)
+            # EOF
+            self.assertEqual(f.readinto(buf), 0)
 
-        with File(self.vol.open(file_name, os.O_RDONLY)) as f:
             self.assertRaises(TypeError, f.readinto, str("buf"))
 
     def test_link(self):
-        name1 = uuid4().hex
+        name1 = self._track(_uname())
         self.vol.fopen(name1, 'w').close()
-        name2 = uuid4().hex
+        name2 = self._track(_uname())
         self.vol.link(name1, name2)
         self.assertTrue(self.vol.samefile(name1, name2))
         self.assertEqual(self.vol.stat(name1).st_nlink, 2)
@@ -637,47 +806,44 @@ class FileOpsTest(unittest.TestCase):
 
     def test_copyfileobj(self):
         # Create source file.
-        src_file = uuid4().hex
+        src_file = self._track(_uname())
+        payload = _RANDOM_PAYLOAD
         with self.vol.fopen(src_file, 'wb') as f:
-            for i in range(2):
-                f.write(os.urandom(128 * 1024))
-            f.write(os.urandom(25 * 1024))
+            f.write(payload)
         # Change/set atime and mtime
         (atime, mtime) = (692884800, 692884800)
         self.vol.utime(src_file, (atime, mtime))
 
-        # Calculate checksum of source file.
-        src_file_checksum = hashlib.md5()
-        with self.vol.fopen(src_file, 'rb') as f:
-            src_file_checksum.update(f.read(32 * 1024))
-
-        # Copy file
-        dest_file = uuid4().hex
-        with self.vol.fopen(src_file, 'rb') as fsrc:
-            with self.vol.fopen(dest_file, 'wb') as fdst:
-                self.vol.copyfileobj(fsrc, fdst)
+        # Copy file. copyfileobj() accepts any file-like source object, so
+        # an in-memory one spares reading the source back from the volume.
+        fsrc = io.BytesIO(payload)
+        dest_file = self._track(_uname())
+        with self.vol.fopen(dest_file, 'wb') as fdst:
+            self.vol.copyfileobj(fsrc, fdst)
 
-        # Calculate checksum of destination
-        dest_file_checksum = hashlib.md5()
+        # Verify destination
         with self.vol.fopen(dest_file, 'rb') as f:
-            dest_file_checksum.update(f.read(32 * 1024))
-
-        self.assertEqual(src_file_checksum.hexdigest(),
-                         dest_file_checksum.hexdigest())
+            self.assertEqual(f.read(), payload)
 
         # Copy file with different buffer size
         self.vol.unlink(dest_file)
-        with self.vol.fopen(src_file, 'rb') as fsrc:
-            with self.vol.fopen(dest_file, 'wb') as fdst:
-                self.vol.copyfileobj(fsrc, fdst, 32 * 1024)
+        fsrc.seek(0)
+        with self.vol.fopen(dest_file, 'wb') as fdst:
+            self.vol.copyfileobj(fsrc, fdst, 32 * 1024)
 
-        # Calculate checksum of destination
-        dest_file_checksum = hashlib.md5()
+        # Verify destination
         with self.vol.fopen(dest_file, 'rb') as f:
-            dest_file_checksum.update(f.read(32 * 1024))
+            self.assertEqual(f.read(), payload)
 
-        self.assertEqual(src_file_checksum.hexdigest(),
-                         dest_file_checksum.hexdigest())
+        # Copy file with a buffer larger than the file
+        self.vol.unlink(dest_file)
+        fsrc.seek(0)
+        with self.vol.fopen(dest_file, 'wb') as fdst:
+            self.vol.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+        # Verify destination
+        with self.vol.fopen(dest_file, 'rb') as f:
+            self.assertEqual(f.read(), payload)
 
         # The destination file should not have same mtime
         src_stat = self.vol.stat(src_file)
@@ -685,14 +851,14 @@ class FileOpsTest(unittest.TestCase):
         self.assertNotEqual(src_stat.st_mtime, dest_stat.st_mtime)
 
         # Test over-writing destination that exists
-        dest_file = uuid4().hex
+        dest_file = self._track(_uname())
         with self.vol.fopen(dest_file, 'w') as f:
             data = "A boy wants this test to not fail."
             f.write(data)
         with self.vol.fopen(src_file, 'rb') as fsrc:
             with self.vol.fopen(dest_file, 'wb') as fdst:
                 self.vol.copyfileobj(fsrc, fdst)
-        self.assertNotEqual(self.vol.stat(src_file).st_size, len(data))
+        self.assertNotEqual(src_stat.st_size, len(data))
 
         # Test one of the file object is closed
         f1 = self.vol.fopen(src_file, 'rb')
@@ -703,22 +869,22 @@ class FileOpsTest(unittest.TestCase):
 
     def test_copyfile_samefile(self):
         # Source and destination same error
-        name = uuid4().hex
+        name = self._track(_uname())
         self.vol.fopen(name, 'w').close()
         self.assertRaises(Error, self.vol.copyfile, name, name)
         # Harlink test
-        name2 = uuid4().hex
+        name2 = self._track(_uname())
         self.vol.link(name, name2)
         self.assertRaises(Error, self.vol.copyfile, name, name2)
 
     def test_copymode(self):
-        src_file = uuid4().hex
-        self.vol.fopen(src_file, 'w').close()
-        self.vol.chmod(src_file, 0o644)
+        src_file = self._track(_uname())
+        File(self.vol.open(src_file, os.O_CREAT | os.O_WRONLY | os.O_EXCL,
+                           0o644)).close()
 
-        dest_file = uuid4().hex
-        self.vol.fopen(dest_file, 'w').close()
-        self.vol.chmod(dest_file, 0o640)
+        dest_file = self._track(_uname())
+        File(self.vol.open(dest_file, os.O_CREAT | os.O_WRONLY | os.O_EXCL,
+                           0o640)).close()
 
         self.vol.copymode(src_file, dest_file)
         self.assertEqual(self.vol.stat(src_file).st_mode,
@@ -726,14 +892,14 @@ class FileOpsTest(unittest.TestCase):
 
     def test_copystat(self):
         # Create source file and set mode, atime, mtime
-        src_file = uuid4().hex
-        self.vol.fopen(src_file, 'w').close()
-        self.vol.chmod(src_file, 0o640)
+        src_file = self._track(_uname())
+        File(self.vol.open(src_file, os.O_CREAT | os.O_WRONLY | os.O_EXCL,
+                           0o640)).close()
         (atime, mtime) = (692884800, 692884800)
         self.vol.utime(src_file, (atime, mtime))
 
         # Create destination file
-        dest_file = uuid4().hex
+        dest_file = self._track(_uname())
         self.vol.fopen(dest_file, 'w').close()
 
         # Invoke copystat()
@@ -748,31 +914,25 @@ class FileOpsTest(unittest.TestCase):
 
     def test_copy(self):
         # Create source file.
-        src_file = uuid4().hex
+        src_file = self._track(_uname())
         with self.vol.fopen(src_file, 'wb') as f:
-            for i in range(2):
-                f.write(os.urandom(128 * 1024))
-            f.write(os.urandom(25 * 1024))
+            f.write(_RANDOM_PAYLOAD)
 
         # Calculate checksum of source file.
-        src_file_checksum = hashlib.md5()
-        with self.vol.fopen(src_file, 'rb') as f:
-            src_file_checksum.update(f.read(32 * 1024))
+        src_file_checksum = _checksum_file(self.vol, src_file)
 
         # Copy file into dir
-        dest_dir = uuid4().hex
+        dest_dir = self._track(_uname(), isdir=True)
         self.vol.mkdir(dest_dir)
         self.vol.copy(src_file, dest_dir)
 
         # Calculate checksum of destination
-        dest_file = os.path.join(dest_dir, src_file)
-        dest_file_checksum = hashlib.md5()
-        with self.vol.fopen(dest_file, 'rb') as f:
-            dest_file_checksum.update(f.read(32 * 1024))
+        dest_file = "%s/%s" % (dest_dir, src_file)
+        dest_file_checksum = _checksum_file(self.vol, dest_file)
 
         # verify data
-        self.assertEqual(src_file_checksum.hexdigest(),
-                         dest_file_checksum.hexdigest())
+        self.assertEqual(src_file_checksum.digest(),
+                         dest_file_checksum.digest())
 
         # verify mode
         src_stat = self.vol.stat(src_file)
@@ -781,33 +941,27 @@ class FileOpsTest(unittest.TestCase):
 
     def test_copy2(self):
         # Create source file.
-        src_file = uuid4().hex
+        src_file = self._track(_uname())
         with self.vol.fopen(src_file, 'wb') as f:
-            for i in range(2):
-                f.write(os.urandom(128 * 1024))
-            f.write(os.urandom(25 * 1024))
+            f.write(_RANDOM_PAYLOAD)
         (atime, mtime) = (692884800, 692884800)
         self.vol.utime(src_file, (atime, mtime))
 
         # Calculate checksum of source file.
-        src_file_checksum = hashlib.md5()
-        with self.vol.fopen(src_file, 'rb') as f:
-            src_file_checksum.update(f.read(32 * 1024))
+        src_file_checksum = _checksum_file(self.vol, src_file)
 
         # Copy file into dir
-        dest_dir = uuid4().hex
+        dest_dir = self._track(_uname(), isdir=True)
         self.vol.mkdir(dest_dir)
         self.vol.copy2(src_file, dest_dir)
 
         # Calculate checksum of destination
-        dest_file = os.path.join(dest_dir, src_file)
-        dest_file_checksum = hashlib.md5()
-        with self.vol.fopen(dest_file, 'rb') as f:
-            dest_file_checksum.update(f.read(32 * 1024))
+        dest_file = "%s/%s" % (dest_dir, src_file)
+        dest_file_checksum = _checksum_file(self.vol, dest_file)
 
         # verify data
-        self.assertEqual(src_file_checksum.hexdigest(),
-                         dest_file_checksum.hexdigest())
+        self.assertEqual(src_file_checksum.digest(),
+                         dest_file_checksum.digest())
 
         # verify mode and stat
         src_stat = self.vol.stat(src_file)
@@ -816,76 +970,122 @@ class FileOpsTest(unittest.TestCase):
         self.assertEqual(src_stat.st_mtime, dest_stat.st_mtime)
 
     def test_mknod(self):
-        self.vol.mknod("dev", stat.S_IFCHR | 0o644, os.makedev(1, 3))
-        st = self.vol.stat("dev")
+        name = self._track(_uname())
+        self.vol.mknod(name, stat.S_IFCHR | 0o644, os.makedev(1, 3))
+        st = self.vol.stat(name)
         self.assertTrue(stat.S_ISCHR(st.st_mode))
         self.assertEqual(os.major(st.st_rdev), 1)
         self.assertEqual(os.minor(st.st_rdev), 3)
 
 
-class DirOpsTest(unittest.TestCase):
-
-    data = None
-    dir_path = None
+class _DirOpsBase(_GfapiTestBase):
+    # Shared by the directory test classes below, which run their tests
+    # against trees that look like this:
+    #
+    # dir_path
+    #    |-- testdir0
+    #    |     |-- nestedfile0
+    #    |     |-- nestedfile1
+    #    |-- testdir1
+    #    |-- testdir2
+    #    |     |-- nestedfile0
+    #    |     |-- nestedfile1
+    #    |-- testfile
+    #    |-- test_symlink_file --> testfile
+    #    |-- test_symlink_dir --> testdir2
+
+    _DATA = b"gluster is awesome"
+    DATA_LEN = len(_DATA)
+    # Layout of the tree created for the tests, see above, as
+    # (relative dir path, mode, file names) with parents before children
+    _TREE_MANIFEST = (("", 0o755, ("testfile",)),
+                      ("testdir0", 0o777, ("nestedfile0", "nestedfile1")),
+                      ("testdir1", 0o777, ()),
+                      ("testdir2", 0o777, ("nestedfile0", "nestedfile1")))
+    # (target, name) pairs
+    _SYMLINKS = (("testfile", "test_symlink_file"),
+                 ("testdir2", "test_symlink_dir"))
+    # Entries of the top level directory and the
+    # (dirs, files, symlinks) counts among them
+    _EXPECTED_LISTING = frozenset(("test_symlink_dir", "test_symlink_file",
+                                   "testdir0", "testdir1", "testdir2",
+                                   "testfile"))
+    _EXPECTED_COUNTS = (3, 1, 2)
+    _pool = None
 
     @classmethod
     def setUpClass(cls):
-        cls.vol = Volume(HOST, VOLNAME)
-        cls.vol.mount()
-        # Cleanup volume
-        cls.vol.rmtree("/", ignore_errors=True)
+        super(_DirOpsBase, cls).setUpClass()
+        # Used to issue independent operations concurrently
+        cls._pool = ThreadPool(8)
 
     @classmethod
     def tearDownClass(cls):
-        cls.vol.rmtree("/", ignore_errors=True)
-        cls.vol = None
+        cls._pool.close()
+        cls._pool.join()
+        cls._pool = None
 
-    def setUp(self):
-        # Create a filesystem tree
-        self.data = "gluster is awesome"
-        self.dir_path = self._testMethodName + "_dir"
-        self.vol.mkdir(self.dir_path, 0o755)
-        for x in range(0, 3):
-            d = os.path.join(self.dir_path, 'testdir' + str(x))
-            self.vol.mkdir(d)
-            # Create files inside two of the three directories
-            if x != 1:
-                for i in range(0, 2):
-                    f = os.path.join(d, 'nestedfile' + str(i))
-                    with self.vol.fopen(f, 'w') as f:
-                        rc = f.write(self.data)
-                        self.assertEqual(rc, len(self.data))
-            # Create single file in root of directory
-            if x == 2:
-                file_path = os.path.join(self.dir_path, "testfile")
-                with self.vol.fopen(file_path, 'w') as f:
-                    rc = f.write(self.data)
-                    self.assertEqual(rc, len(self.data))
+    @classmethod
+    def _write_file(cls, path):
+        with cls.vol.fopen(path, 'w') as f:
+            return f.write(cls._DATA)
+
+    @classmethod
+    def _build_tree(cls, dir_path, manifest, symlinks=()):
+        # Creates everything listed in the manifest, plus the given
+        # (target, name) symlinks, under dir_path in one call. Directories
+        # at the same depth do not depend on each other and are created
+        # concurrently, one wave per depth. All files and symlinks are
+        # then created in a single final wave: symlink targets need not
+        # exist yet. Returns the write return codes.
+        waves = collections.defaultdict(list)
+        jobs = []
+        for rel, mode, names in manifest:
+            path = "%s/%s" % (dir_path, rel) if rel else dir_path
+            waves[rel.count("/") + 1 if rel else 0].append((path, mode))
+            jobs.extend((cls._write_file, ("%s/%s" % (path, name),))
+                        for name in names)
+        nfiles = len(jobs)
+        jobs.extend((cls.vol.symlink, (target, "%s/%s" % (dir_path, name)))
+                    for target, name in symlinks)
+
+        for depth in sorted(waves):
+            cls._pool.map(lambda args: cls.vol.mkdir(*args), waves[depth])
+        rcs = cls._pool.map(lambda job: job[0](*job[1]), jobs)
+        return rcs[:nfiles]
 
+    @classmethod
+    def _create_tree(cls, dir_path):
         # Create symlinks - one pointing to a file and another to a dir
-        # Beware: rmtree() cannot remove these symlinks
-        self.vol.symlink("testfile",
-                         os.path.join(self.dir_path, 'test_symlink_file'))
-        self.vol.symlink("testdir2",
-                         os.path.join(self.dir_path, 'test_symlink_dir'))
-
-        # The dir tree set up for testing now looks like this:
-        # test_name_here
-        #    |-- testdir0
-        #    |     |-- nestedfile0
-        #    |     |-- nestedfile1
-        #    |-- testdir1
-        #    |-- testdir2
-        #    |     |-- nestedfile0
-        #    |     |-- nestedfile1
-        #    |-- testfile
-        #    |-- testsymlink_file --> testfile
-        #    |-- testsymlink_dir --> testdir2
+        return cls._build_tree(dir_path, cls._TREE_MANIFEST, cls._SYMLINKS)
 
-    def tearDown(self):
-        self._symlinks_cleanup()
-        self.dir_path = None
-        self.data = None
+
+class DirOpsReadOnlyTest(_DirOpsBase, unittest.TestCase):
+    # The tests of this class only read the tree, so it is created once
+    # for the class, and walks of it are shared between tests as well.
+
+    @classmethod
+    def setUpClass(cls):
+        super(DirOpsReadOnlyTest, cls).setUpClass()
+        cls.dir_path = "%s_dir" % _uname()
+        cls._create_tree(cls.dir_path)
+        cls._walk_cache = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        _fast_rmtree(cls.vol, cls.dir_path, cls._pool)
+        cls._walk_cache = None
+        super(DirOpsReadOnlyTest, cls).tearDownClass()
+
+    @classmethod
+    def _walk_cached(cls, topdown=True, followlinks=False):
+        # Walk the shared tree only once per (topdown, followlinks) pair
+        key = (topdown, followlinks)
+        if key not in cls._walk_cache:
+            cls._walk_cache[key] = tuple(
+                cls.vol.walk(cls.dir_path, topdown=topdown,
+                             followlinks=followlinks))
+        return cls._walk_cache[key]
 
     def test_isdir(self):
         self.assertTrue(self.vol.isdir(self.dir_path))
@@ -893,148 +1093,129 @@ class DirOpsTest(unittest.TestCase):
 
     def test_listdir(self):
         dir_list = self.vol.listdir(self.dir_path)
-        dir_list.sort()
-        self.assertEqual(dir_list,
-                         ["test_symlink_dir", "test_symlink_file",
-                          "testdir0", "testdir1", "testdir2", "testfile"])
+        self.assertEqual(len(dir_list), len(self._EXPECTED_LISTING))
+        self.assertEqual(set(dir_list), self._EXPECTED_LISTING)
 
     def test_listdir_with_stat(self):
+        # Only the counts are checked, so the order of entries is irrelevant
         dir_list = self.vol.listdir_with_stat(self.dir_path)
-        dir_list_sorted = sorted(dir_list, key=lambda tup: tup[0])
         dir_count = 0
         file_count = 0
         symlink_count = 0
-        for index, (name, stat_info) in enumerate(dir_list_sorted):
-            self.assertTrue(isinstance(stat_info, Stat))
-            if stat.S_ISREG(stat_info.st_mode):
-                self.assertEqual(stat_info.st_size, len(self.data))
+        isreg, isdir, islnk = stat.S_ISREG, stat.S_ISDIR, stat.S_ISLNK
+        size = self.DATA_LEN
+        if dir_list:
+            self.assertTrue(isinstance(dir_list[0][1], Stat))
+        for name, stat_info in dir_list:
+            mode = stat_info.st_mode
+            if isreg(mode):
+                self.assertEqual(stat_info.st_size, size)
                 file_count += 1
-            elif stat.S_ISDIR(stat_info.st_mode):
+            elif isdir(mode):
                 self.assertEqual(stat_info.st_size, 4096)
                 dir_count += 1
-            elif stat.S_ISLNK(stat_info.st_mode):
+            elif islnk(mode):
                 symlink_count += 1
-        self.assertEqual(dir_count, 3)
-        self.assertEqual(file_count, 1)
-        self.assertEqual(symlink_count, 2)
+        self.assertEqual((dir_count, file_count, symlink_count),
+                         self._EXPECTED_COUNTS)
 
         # Error - path does not exist
         self.assertRaises(OSError,
                           self.vol.listdir_with_stat, 'non-existent-dir')
 
     def test_scandir(self):
-        entries = []
-        for entry in self.vol.scandir(self.dir_path):
-            self.assertTrue(isinstance(entry, DirEntry))
-            entries.append(entry)
+        entries = list(self.vol.scandir(self.dir_path))
 
         dir_count = 0
         file_count = 0
         symlink_count = 0
-        entries_sorted = sorted(entries, key=lambda e: e.name)
+        entries_sorted = sorted(entries, key=attrgetter("name"))
+        if entries_sorted:
+            self.assertTrue(isinstance(entries_sorted[0], DirEntry))
+            self.assertTrue(isinstance(entries_sorted[0].stat(), Stat))
         for index, entry in enumerate(entries_sorted):
-            self.assertTrue(isinstance(entry.stat(), Stat))
+            s = entry.stat()
             if entry.is_file():
-                self.assertEqual(entry.stat().st_size, len(self.data))
+                self.assertEqual(s.st_size, self.DATA_LEN)
                 self.assertFalse(entry.is_dir())
                 file_count += 1
             elif entry.is_dir():
-                self.assertEqual(entry.stat().st_size, 4096)
+                self.assertEqual(s.st_size, 4096)
                 self.assertFalse(entry.is_file())
                 dir_count += 1
             elif entry.is_symlink():
                 symlink_count += 1
-        self.assertEqual(dir_count, 3)
-        self.assertEqual(file_count, 1)
-        self.assertEqual(symlink_count, 2)
-
-    def test_makedirs(self):
-        name = self.dir_path + "/subd1/subd2/subd3"
-        self.vol.makedirs(name, 0o755)
-        self.assertTrue(self.vol.isdir(name))
-
-    def test_statvfs(self):
-        sb = self.vol.statvfs("/")
-        self.assertFalse(isinstance(sb, int))
-        self.assertEqual(sb.f_namemax, 255)
-        # creating a dir, checking Total number of free inodes
-        # is reduced
-        self.vol.makedirs("statvfs_dir1", 0o755)
-        sb2 = self.vol.statvfs("/")
-        self.assertTrue(sb2.f_ffree < sb.f_ffree)
-
-    def test_rmtree(self):
-        # By testing rmtree, we are also testing unlink and rmdir
-        f = os.path.join(self.dir_path, "testdir0", "nestedfile0")
-        self.vol.exists(f)
-        d = os.path.join(self.dir_path, "testdir0")
-        self.vol.rmtree(d, True)
-        self.assertRaises(OSError, self.vol.lstat, f)
-        self.assertRaises(OSError, self.vol.lstat, d)
+        self.assertEqual((dir_count, file_count, symlink_count),
+                         self._EXPECTED_COUNTS)
+
+    def test_scandir_stat_matches_lstat(self):
+        # The stat cached from readdirplus describes the same inode as a
+        # fresh lstat(), and for a regular file there is nothing to follow.
+        entry = next(e for e in self.vol.scandir(self.dir_path)
+                     if e.is_file())
+        s = entry.stat()
+        ls = self.vol.lstat(entry.path)
+        self.assertEqual((s.st_ino, s.st_mode), (ls.st_ino, ls.st_mode))
+        self.assertTrue(entry.stat(follow_symlinks=True) is s)
 
     def test_walk_default(self):
         # Default: topdown=True, followlinks=False
-        file_list = []
-        dir_list = []
-        for root, dirs, files in self.vol.walk(self.dir_path):
-            for name in files:
-                file_list.append(name)
-            for name in dirs:
-                dir_list.append(name)
-        self.assertEqual(len(dir_list), 3)  # 3 regular directories
-        self.assertEqual(len(file_list), 7)  # 5 regular files + 2 symlinks
+        file_count = 0
+        dir_count = 0
+        for root, dirs, files in self._walk_cached():
+            file_count += len(files)
+            dir_count += len(dirs)
+        self.assertEqual(dir_count, 3)  # 3 regular directories
+        self.assertEqual(file_count, 7)  # 5 regular files + 2 symlinks
 
     def test_walk_topdown_and_followinks(self):
         # topdown=True, followlinks=True
-        file_list = []
-        dir_list = []
-        for root, dirs, files in self.vol.walk(self.dir_path,
-                                               followlinks=True):
-            for name in files:
-                file_list.append(name)
-            for name in dirs:
-                dir_list.append(name)
+        file_count = 0
+        dir_count = 0
+        for root, dirs, files in self._walk_cached(followlinks=True):
+            file_count += len(files)
+            dir_count += len(dirs)
         # 4 = 3 regular directories +
         #     1 symlink which is pointing to a directory
-        self.assertEqual(len(dir_list), 4)
+        self.assertEqual(dir_count, 4)
         # 8 = 5 regular files +
         #     1 symlink that points to a file +
         #     2 regular files listed again as they are in a directory which has
         #       a symlink pointing to it. This results in that directory being
         #       visited twice.
-        self.assertEqual(len(file_list), 8)
+        self.assertEqual(file_count, 8)
 
     def test_walk_no_topdown_no_followlinks(self):
         # topdown=False, followlinks=False
-        file_list = []
-        dir_list = []
-        for root, dirs, files in self.vol.walk(self.dir_path, topdown=False):
-            for name in files:
-                file_list.append(name)
-            for name in dirs:
-                dir_list.append(name)
-        self.assertEqual(len(dir_list), 3)  # 3 regular directories
-        self.assertEqual(len(file_list), 7)  # 5 regular files + 2 symlinks
+        walk = self._walk_cached(topdown=False)
+        # The top directory comes after all of its subdirectories
+        self.assertEqual(walk[-1][0], self.dir_path)
+        file_count = 0
+        dir_count = 0
+        for root, dirs, files in walk:
+            file_count += len(files)
+            dir_count += len(dirs)
+        self.assertEqual(dir_count, 3)  # 3 regular directories
+        self.assertEqual(file_count, 7)  # 5 regular files + 2 symlinks
 
     def test_walk_no_topdown_and_followlinks(self):
         # topdown=False, followlinks=True
-        file_list = []
-        dir_list = []
-        for root, dirs, files in self.vol.walk(self.dir_path, topdown=False,
-                                               followlinks=True):
-            for name in files:
-                file_list.append(name)
-            for name in dirs:
-                dir_list.append(name)
+        walk = self._walk_cached(topdown=False, followlinks=True)
+        self.assertEqual(walk[-1][0], self.dir_path)
+        file_count = 0
+        dir_count = 0
+        for root, dirs, files in walk:
+            file_count += len(files)
+            dir_count += len(dirs)
         # 4 = 3 regular directories +
         #     1 symlink which is pointing to a directory
-        self.assertEqual(len(dir_list), 4)
+        self.assertEqual(dir_count, 4)
         # 8 = 5 regular files +
         #     1 symlink that points to a file +
         #     2 regular files listed again as they are in a directory which has
         #       a symlink pointing to it. This results in that directory being
         #       visited twice.
-        self.assertEqual(len(file_list), 8)
+        self.assertEqual(file_count, 8)
 
     def test_walk_error(self):
         # Test onerror handling
@@ -1058,39 +1239,83 @@ class DirOpsTest(unittest.TestCase):
         else:
             self.fail("Expecting OSError exception")
 
-    def _symlinks_cleanup(self):
-        # rmtree() cannot remove these symlinks, hence removing manually.
-        symlinks = ('test_symlink_dir', 'test_symlink_file')
-        for name in symlinks:
-            try:
-                self.vol.unlink(os.path.join(self.dir_path, name))
-            except OSError as err:
-                if err.errno != errno.ENOENT:
-                    raise
+
+class DirOpsMutatingTest(_DirOpsBase, unittest.TestCase):
+    # Each test gets a tree of its own to modify, and only removes what
+    # it created, so nose's multiprocess plugin may spread the tests
+    # across worker processes.
+    _multiprocess_can_split_ = True
+
+    def setUp(self):
+        super(DirOpsMutatingTest, self).setUp()
+        # Create a filesystem tree
+        self.dir_path = self._track(
+            "%s_%s_dir" % (self._testMethodName, _uname()), isdir=True)
+        for rc in self._create_tree(self.dir_path):
+            self.assertEqual(rc, self.DATA_LEN)
+
+    def tearDown(self):
+        # Tracked trees are removed with the concurrent _fast_rmtree();
+        # anything else is left to the base class.
+        others = []
+        for path, isdir in self._created:
+            if isdir:
+                _fast_rmtree(self.vol, path, self._pool)
+            else:
+                others.append((path, isdir))
+        self._created = others
+        super(DirOpsMutatingTest, self).tearDown()
+
+    def _walk_and_classify(self, path):
+        # Walk the tree once using scandir() so that entry types come from
+        # the stat information fetched by readdirplus, without any further
+        # lstat calls. Returns (dir_list, file_list, symlink_count).
+        dir_list = []
+        file_list = []
+        symlink_count = 0
+        stack = [path]
+        while stack:
+            for entry in self.vol.scandir(stack.pop()):
+                if entry.is_dir():
+                    dir_list.append(entry.name)
+                    stack.append(entry.path)
+                else:
+                    file_list.append(entry.name)
+                    if entry.is_symlink():
+                        symlink_count += 1
+        return dir_list, file_list, symlink_count
+
+    def test_makedirs(self):
+        name = self.dir_path + "/subd1/subd2/subd3"
+        self.vol.makedirs(name, 0o755)
+        self.assertTrue(self.vol.isdir(name))
+
+    def test_statvfs(self):
+        sb = self.vol.statvfs("/")
+        self.assertFalse(isinstance(sb, int))
+        self.assertEqual(sb.f_namemax, 255)
+        # creating a dir, checking Total number of free inodes
+        # is reduced
+        self.vol.makedirs("%s/statvfs_dir1" % self.dir_path, 0o755)
+        sb2 = self.vol.statvfs("/")
+        self.assertTrue(sb2.f_ffree < sb.f_ffree)
+
+    def test_rmtree(self):
+        # By testing rmtree, we are also testing unlink and rmdir
+        self.vol.rmtree("%s/testdir0" % self.dir_path, True)
+        self.assertEqual(self.vol.listdir(self.dir_path).count("testdir0"), 0)
 
     def test_copy_tree(self):
-        dest_path = self.dir_path + '_dest'
+        dest_path = self._track(self.dir_path + '_dest', isdir=True)
 
         # symlinks = False (contents pointed by symlinks are copied)
         self.vol.copytree(self.dir_path, dest_path, symlinks=False)
 
-        file_list = []
-        dir_list = []
-        for root, dirs, files in self.vol.walk(dest_path):
-            for name in files:
-                fullpath = os.path.join(root, name)
-                s = self.vol.lstat(fullpath)
-                # Assert that there are no symlinks
-                self.assertFalse(stat.S_ISLNK(s.st_mode))
-                file_list.append(name)
-            for name in dirs:
-                fullpath = os.path.join(root, name)
-                s = self.vol.lstat(fullpath)
-                # Assert that there are no symlinks
-                self.assertFalse(stat.S_ISLNK(s.st_mode))
-                dir_list.append(name)
+        dir_list, file_list, symlink_count = \
+            self._walk_and_classify(dest_path)
         self.assertEqual(len(dir_list), 4)  # 4 regular directories
         self.assertEqual(len(file_list), 8)  # 8 regular files
+        self.assertEqual(symlink_count, 0)  # Assert that there are no symlinks
 
         # Cleanup
         self.vol.rmtree(dest_path)
@@ -1098,15 +1323,11 @@ class DirOpsTest(unittest.TestCase):
         # symlinks = True (symlinks itself is copied as is)
         self.vol.copytree(self.dir_path, dest_path, symlinks=True)
 
-        file_list = []
-        dir_list = []
-        for root, dirs, files in self.vol.walk(dest_path):
-            for name in files:
-                file_list.append(name)
-            for name in dirs:
-                dir_list.append(name)
+        dir_list, file_list, symlink_count = \
+            self._walk_and_classify(dest_path)
         self.assertEqual(len(dir_list), 3)  # 3 regular directories
         self.assertEqual(len(file_list), 7)  # 5 regular files + 2 symlinks
+        self.assertEqual(symlink_count, 2)
 
         # Error - The destination directory must not exist
         self.assertRaises(OSError, self.vol.copytree, self.dir_path, dest_path)
@@ -1128,6 +1349,11 @@ class TestVolumeInit(unittest.TestCase):
         vol.mount()
         # Check mounted property
         self.assertTrue(vol.mounted)
+        # Do a double mount - should not crash, raise exception or remount
+        fs = vol.fs
+        vol.mount()
+        self.assertTrue(vol.mounted)
+        self.assertEqual(vol.fs, fs)
         # Unmount the volume
         vol.umount()
         # Check mounted property again
@@ -1135,23 +1361,16 @@ class TestVolumeInit(unittest.TestCase):
         # Do a double umount - should not crash or raise exception
         vol.umount()
         self.assertFalse(vol.mounted)
-        # Do a double mount - should not crash or raise exception
-        vol.mount()
-        vol.mount()
-        self.assertTrue(vol.mounted)
-        # Unmount the volume
-        vol.umount()
-        self.assertFalse(vol.mounted)
 
     def test_mount_err(self):
         # Volume does not exist
-        fake_volname = str(uuid4().hex)[:10]
+        fake_volname = _uname()
         vol = Volume(HOST, fake_volname)
         self.assertRaises(LibgfapiException, vol.mount)
         self.assertFalse(vol.mounted)
 
         # Invalid host - glfs_set_volfile_server will fail
-        fake_hostname = str(uuid4().hex)[:10]
+        fake_hostname = _uname()
         vol = Volume(fake_hostname, VOLNAME)
         self.assertRaises(LibgfapiException, vol.mount)
         self.assertFalse(vol.mounted)
@@ -1160,7 +1379,7 @@ class TestVolumeInit(unittest.TestCase):
         # Create volume object instance
         vol = Volume(HOST, VOLNAME)
         # Call set_logging before mount()
-        log_file = "/tmp/%s" % (uuid4().hex)
+        log_file = "/tmp/%s" % _uname()
         vol.set_logging(log_file, 7)
         # Mount the volume
         vol.mount()
@@ -1170,7 +1389,7 @@ class TestVolumeInit(unittest.TestCase):
         # Check that log has been created and exists
         self.assertTrue(os.path.exists(log_file))
         # Change the logging after mounting
-        log_file2 = "/tmp/%s" % (uuid4().hex)
+        log_file2 = "/tmp/%s" % _uname()
         vol.set_logging(log_file2, 7)
         self.assertEqual(vol.log_file, log_file2)
         # Unmount the volume